@@ -1,7 +1,8 @@
+import io
 import os
 import sys
 import traceback
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import Flask, Request, render_template, request, redirect, url_for, flash, session
 from werkzeug.utils import secure_filename
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SubmitField, MultipleFileField, BooleanField, SelectField, PasswordField
@@ -10,25 +11,82 @@ import pdfminer.high_level
 from docx import Document
 import magic
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+from scipy import sparse
 import re
+import multiprocessing
+import json
+import functools
+import hashlib
+import threading
+import time
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import and_, event, inspect, text as sql_text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import joinedload
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+
+class InMemoryUploadRequest(Request):
+    # Uploads are extracted from their bytes and are capped by MAX_CONTENT_LENGTH,
+    # so parse file parts straight into memory instead of spooling to temp files
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return io.BytesIO()
 
 # Initialize Flask app
 app = Flask(__name__)
+app.request_class = InMemoryUploadRequest
 app.config.from_object('config.Config')
 
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    # WAL lets dashboard reads proceed while a write is in progress
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
 db = SQLAlchemy(app)
 
-# Ensure upload folder exists
+# Ensure extraction cache folder exists
 try:
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    os.makedirs(app.config['EXTRACT_CACHE_FOLDER'], exist_ok=True)
 except Exception as e:
-    print(f"Error creating upload folder: {str(e)}")
+    print(f"Error creating extraction cache folder: {str(e)}")
     sys.exit(1)
 
+# argon2id password hashing; legacy pbkdf2 hashes are upgraded on next login
+_PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+
+# Precompiled text-cleaning patterns
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_NON_SKILL_RE = re.compile(r'[^\w\s-]')
+_WS_RE = re.compile(r'\s+')
+
+# Worker processes for CPU-bound CV text extraction, created on first use so
+# pre-forking servers don't inherit a pool from the master process
+_EXTRACT_POOL = None
+_EXTRACT_POOL_LOCK = threading.Lock()
+
+# Cached CV text is personal data, so the cache is swept for expired entries
+# and held under a size cap; this records the last sweep in this process
+_LAST_CACHE_SWEEP = 0.0
+_CACHE_SWEEP_LOCK = threading.Lock()
+
+# Per-CV dashboard scores kept by the job index until its next rebuild; each
+# entry is one float32 per active job, so the cache is bounded by bytes
+_SCORE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 # Database Models
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -39,24 +97,43 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class JobPost(db.Model):
+    __table_args__ = (
+        db.Index('ix_jobpost_active_created', 'is_active', 'created_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     job_title = db.Column(db.String(200), nullable=False)
     company_name = db.Column(db.String(200), nullable=False)
     job_description = db.Column(db.Text, nullable=False)
+    job_description_clean = db.Column(db.Text)
     required_skills = db.Column(db.Text, nullable=False)
+    required_skills_normalized = db.Column(db.Text)
     location = db.Column(db.String(100))
     salary_range = db.Column(db.String(100))
     job_type = db.Column(db.String(50))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     is_active = db.Column(db.Boolean, default=True)
     user = db.relationship('User', backref=db.backref('job_posts', lazy=True))
+    
+    @property
+    def skills_list(self):
+        # Normalized once at post time; older rows are parsed on the fly
+        if self.required_skills_normalized is not None:
+            return json.loads(self.required_skills_normalized)
+        return parse_skills(self.required_skills)
+    
+    @property
+    def description_clean(self):
+        if self.job_description_clean is not None:
+            return self.job_description_clean
+        return clean_text(self.job_description)
 
 class JobSeekerProfile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     full_name = db.Column(db.String(200), nullable=False)
     resume_text = db.Column(db.Text)
+    resume_text_clean = db.Column(db.Text)
     skills = db.Column(db.Text)
     desired_position = db.Column(db.String(200))
     desired_location = db.Column(db.String(100))
@@ -64,11 +141,24 @@ class JobSeekerProfile(db.Model):
     experience_level = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     user = db.relationship('User', backref=db.backref('profile', uselist=False))
+    
+    @property
+    def match_text_clean(self):
+        # The resume is what gets matched; profiles without one fall back to their skills
+        if self.resume_text:
+            if self.resume_text_clean is not None:
+                return self.resume_text_clean
+            return clean_text(self.resume_text)
+        return clean_text(self.skills)
 
 class JobApplication(db.Model):
+    __table_args__ = (
+        db.Index('ix_application_post_seeker', 'job_post_id', 'job_seeker_id'),
+        db.Index('ix_application_post_score', 'job_post_id', 'match_score'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     job_post_id = db.Column(db.Integer, db.ForeignKey('job_post.id'), nullable=False)
-    job_seeker_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    job_seeker_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     match_score = db.Column(db.Float)
     status = db.Column(db.String(50), default='pending')
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -76,100 +166,433 @@ class JobApplication(db.Model):
     job_seeker = db.relationship('User', foreign_keys=[job_seeker_id])
 
 # Helper Functions
+def hash_password(password):
+    return _PASSWORD_HASHER.hash(password)
+
+def verify_password(user, password):
+    """Check a login password, upgrading legacy werkzeug hashes to argon2id on success."""
+    if not user.password_hash:
+        return False
+    if user.password_hash.startswith('$argon2'):
+        try:
+            _PASSWORD_HASHER.verify(user.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        if _PASSWORD_HASHER.check_needs_rehash(user.password_hash):
+            user.password_hash = hash_password(password)
+        return True
+    if check_password_hash(user.password_hash, password):
+        user.password_hash = hash_password(password)
+        return True
+    return False
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
-def extract_text_from_pdf(pdf_path):
+@functools.lru_cache(maxsize=None)
+def mime_detector():
+    # Loading the libmagic database is expensive, so share one instance
+    return magic.Magic(mime=True)
+
+def extract_text_from_pdf(pdf_source):
     try:
-        return pdfminer.high_level.extract_text(pdf_path)
+        return pdfminer.high_level.extract_text(pdf_source)
     except Exception as e:
         raise Exception(f"Failed to extract PDF text: {str(e)}")
 
-def extract_text_from_docx(docx_path):
+def extract_text_from_docx(docx_source):
     try:
-        doc = Document(docx_path)
+        doc = Document(docx_source)
         return "\n".join([para.text for para in doc.paragraphs])
     except Exception as e:
         raise Exception(f"Failed to extract DOCX text: {str(e)}")
 
-def extract_text_from_file(file_path):
+def extraction_cache_path(filename, file_bytes):
+    ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    digest = hashlib.blake2b(file_bytes, digest_size=32).hexdigest()
+    return os.path.join(app.config['EXTRACT_CACHE_FOLDER'], f"{digest}.{ext or 'bin'}.txt")
+
+def remove_cache_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def read_extraction_cache(cache_path):
+    try:
+        if time.time() - os.path.getmtime(cache_path) < app.config['EXTRACT_CACHE_TTL']:
+            with open(cache_path, encoding='utf-8') as cache_file:
+                return cache_file.read()
+        remove_cache_file(cache_path)
+    except OSError:
+        pass
+    return None
+
+def sweep_extraction_cache():
+    """Delete expired cache entries, then the oldest ones while the cache exceeds its size cap."""
+    now = time.time()
+    entries = []
+    total_size = 0
+    for entry in os.scandir(app.config['EXTRACT_CACHE_FOLDER']):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime >= app.config['EXTRACT_CACHE_TTL']:
+            remove_cache_file(entry.path)
+        else:
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+    
+    entries.sort()
+    for _, size, path in entries:
+        if total_size <= app.config['EXTRACT_CACHE_MAX_BYTES']:
+            break
+        remove_cache_file(path)
+        total_size -= size
+
+def maybe_sweep_extraction_cache():
+    global _LAST_CACHE_SWEEP
+    with _CACHE_SWEEP_LOCK:
+        if time.time() - _LAST_CACHE_SWEEP < app.config['EXTRACT_CACHE_SWEEP_INTERVAL']:
+            return
+        _LAST_CACHE_SWEEP = time.time()
+    try:
+        sweep_extraction_cache()
+    except OSError as e:
+        print(f"Extraction cache sweep warning: {str(e)}")
+
+def write_extraction_cache(cache_path, text):
+    # Write then rename so concurrent readers never see a partial file
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+            cache_file.write(text)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Extraction cache write warning: {str(e)}")
+        remove_cache_file(tmp_path)
+    maybe_sweep_extraction_cache()
+
+def extract_text_from_file(filename, file_bytes):
+    """Extract text from an uploaded file, reusing earlier extractions of identical content."""
+    cache_path = extraction_cache_path(filename, file_bytes)
+    text = read_extraction_cache(cache_path)
+    if text is None:
+        text = extract_text_from_bytes(filename, file_bytes)
+        write_extraction_cache(cache_path, text)
+    return text
+
+def extract_text_from_bytes(filename, file_bytes):
     try:
-        mime = magic.Magic(mime=True)
-        file_type = mime.from_file(file_path)
+        # allowed_file already limits uploads to known extensions, so dispatch on those first
+        ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+        if ext == 'pdf':
+            return extract_text_from_pdf(io.BytesIO(file_bytes))
+        elif ext == 'docx':
+            return extract_text_from_docx(io.BytesIO(file_bytes))
         
+        # Fall back to sniffing the content for anything else
+        file_type = mime_detector().from_buffer(file_bytes[:4096])
         if file_type == 'application/pdf':
-            return extract_text_from_pdf(file_path)
+            return extract_text_from_pdf(io.BytesIO(file_bytes))
         elif file_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-            return extract_text_from_docx(file_path)
-        else:
-            # Try extension-based fallback
-            ext = file_path.rsplit('.', 1)[1].lower()
-            if ext == 'pdf':
-                return extract_text_from_pdf(file_path)
-            elif ext == 'docx':
-                return extract_text_from_docx(file_path)
+            return extract_text_from_docx(io.BytesIO(file_bytes))
         raise ValueError(f"Unsupported file type: {file_type}")
     except Exception as e:
         raise Exception(f"File processing error: {str(e)}")
 
+def extract_pool():
+    global _EXTRACT_POOL
+    with _EXTRACT_POOL_LOCK:
+        if _EXTRACT_POOL is None:
+            # The pool is started lazily from a request thread; forking there under
+            # threaded gunicorn workers can inherit a lock held by another thread
+            _EXTRACT_POOL = ProcessPoolExecutor(
+                max_workers=app.config['EXTRACT_WORKERS'],
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+        return _EXTRACT_POOL
+
+def replace_broken_extract_pool(broken_pool):
+    # A worker that dies (e.g. OOM-killed on a hostile PDF) breaks the whole pool;
+    # drop it so the next caller gets a fresh one
+    global _EXTRACT_POOL
+    with _EXTRACT_POOL_LOCK:
+        if _EXTRACT_POOL is broken_pool:
+            _EXTRACT_POOL = None
+    broken_pool.shutdown(wait=False)
+
+def submit_extraction(filename, file_bytes):
+    pool = extract_pool()
+    try:
+        return pool, pool.submit(extract_text_from_bytes, filename, file_bytes)
+    except BrokenProcessPool:
+        replace_broken_extract_pool(pool)
+        pool = extract_pool()
+        return pool, pool.submit(extract_text_from_bytes, filename, file_bytes)
+
 def normalize_skill(skill):
     try:
-        skill = re.sub(r'[^\w\s-]', '', skill.lower())
-        return re.sub(r'\s+', ' ', skill).strip()
+        skill = _NON_SKILL_RE.sub('', skill.lower())
+        return _WS_RE.sub(' ', skill).strip()
     except Exception as e:
         raise Exception(f"Skill normalization error: {str(e)}")
 
-def calculate_match(cv_text, job_description, required_skills):
+def clean_text(text):
+    return _NON_WORD_RE.sub(' ', (text or "").lower())
+
+def parse_skills(required_skills):
+    return [normalize_skill(skill.strip()) for skill in (required_skills or "").split(',') if skill.strip()]
+
+def text_digest(text):
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+def partition_skills(skills):
+    """Split normalized skills into single words and (phrase, pattern) pairs."""
+    single_word_skills = frozenset(skill for skill in skills if skill and ' ' not in skill)
+    # A skill that normalized to '' keeps the baseline's r'\b\b' pattern, which
+    # matches any CV with a word in it
+    multi_word_skills = tuple(
+        (skill, re.compile(rf'\b{re.escape(skill)}\b'))
+        for skill in dict.fromkeys(skills) if ' ' in skill or not skill
+    )
+    return single_word_skills, multi_word_skills
+
+# Per-job skill lists repeat across requests; the job index partitions its
+# whole-corpus skill set itself, so that tuple never lands in this cache
+@functools.lru_cache(maxsize=1024)
+def split_skills(skills):
+    return partition_skills(skills)
+
+def find_skills(cv_clean, single_word_skills, multi_word_skills):
+    # cv_clean holds only word characters and whitespace, so a whole-word match
+    # is a token match; phrases keep the exact whole-word regex so they never
+    # match across the extra spaces left where punctuation was stripped
+    found = set(cv_clean.split()) & single_word_skills
+    found.update(skill for skill, pattern in multi_word_skills if pattern.search(cv_clean))
+    return found
+
+def compute_skills_match(cv_clean, skills_list):
+    found_skills = []
+    if skills_list and cv_clean:
+        found = find_skills(cv_clean, *split_skills(tuple(skills_list)))
+        found_skills = [skill for skill in skills_list if skill in found]
+    
+    skills_match = len(found_skills) / len(skills_list) if skills_list else 0
+    return skills_match, found_skills
+
+def build_match_result(jd_match, skills_match, skills_list, found_skills):
+    total_score = (skills_match * 0.6 + jd_match * 0.4) * 100
+    
+    return {
+        'total_score': round(total_score, 2),
+        'jd_match': round(jd_match * 100, 2),
+        'skills_match': round(skills_match * 100, 2),
+        'missing_skills': ', '.join(list(set(skills_list) - set(found_skills))),
+        'found_skills': ', '.join(found_skills)
+    }
+
+def empty_match_result():
+    return {
+        'total_score': 0,
+        'jd_match': 0,
+        'skills_match': 0,
+        'missing_skills': '',
+        'found_skills': ''
+    }
+
+def batch_jd_match(jd_clean, cv_cleans):
+    """Score every cleaned CV against the cleaned JD with a single TF-IDF fit."""
+    jd_matches = [0.0] * len(cv_cleans)
+    if not jd_clean.strip() or not any(cv_clean.strip() for cv_clean in cv_cleans):
+        return jd_matches
     try:
-        if not cv_text:
-            cv_text = ""
-        if not job_description:
-            job_description = ""
-            
-        cv_clean = re.sub(r'[^\w\s]', ' ', cv_text.lower())
-        jd_clean = re.sub(r'[^\w\s]', ' ', job_description.lower())
-        
-        skills_list = [normalize_skill(skill.strip()) for skill in required_skills.split(',') if skill.strip()]
+        vectorizer = TfidfVectorizer(stop_words='english', min_df=1)
+        tfidf_matrix = vectorizer.fit_transform([jd_clean] + cv_cleans)
+        # Rows are L2-normalized, so the dot product is the cosine
+        similarities = (tfidf_matrix[1:] @ tfidf_matrix[0].T).toarray().ravel()
+        jd_matches = [float(sim) if cv_clean.strip() else 0.0
+                      for sim, cv_clean in zip(similarities, cv_cleans)]
+    except Exception as e:
+        print(f"JD match calculation warning: {str(e)}")
+    return jd_matches
+
+def calculate_matches(cv_cleans, job_post):
+    """Score a batch of cleaned CVs against one job, fitting TF-IDF on the JD and these CVs."""
+    try:
+        skills_list = job_post.skills_list
         
         # JD Match (40% weight)
-        jd_match = 0
-        if jd_clean.strip() and cv_clean.strip():
+        jd_matches = batch_jd_match(job_post.description_clean, cv_cleans)
+        
+        # Skills Match (60% weight)
+        results = []
+        for cv_clean, jd_match in zip(cv_cleans, jd_matches):
+            skills_match, found_skills = compute_skills_match(cv_clean, skills_list)
+            results.append(build_match_result(jd_match, skills_match, skills_list, found_skills))
+        return results
+    except Exception as e:
+        print(f"Match calculation error: {str(e)}")
+        return [empty_match_result() for _ in cv_cleans]
+
+# Job Corpus Index
+class JobCorpusIndex:
+    """TF-IDF and skill matrices over the active job posts, shared by the dashboard and apply_job scores."""
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.job_ids = ()
+        self.job_id_set = frozenset()
+        self.positions = {}
+        self.vectorizer = None
+        self.X_jobs = None
+        self.skill_positions = {}
+        self.single_word_skills = frozenset()
+        self.multi_word_skills = ()
+        self.skill_matrix = None
+        self.skill_totals = None
+        # Scores by CV content digest; only valid for the current build
+        self.score_cache = OrderedDict()
+    
+    def invalidate(self):
+        with self._lock:
+            self.job_ids = ()
+            self.job_id_set = frozenset()
+    
+    def _build(self, jobs):
+        job_ids = tuple(job.id for job in jobs)
+        jd_cleans = [job.description_clean for job in jobs]
+        
+        vectorizer, X_jobs = None, None
+        if any(jd_clean.strip() for jd_clean in jd_cleans):
             try:
-                vectorizer = TfidfVectorizer(stop_words='english', min_df=1)
-                tfidf_matrix = vectorizer.fit_transform([jd_clean, cv_clean])
-                jd_match = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+                vectorizer = TfidfVectorizer(stop_words='english', min_df=1, dtype=np.float32)
+                # Column-major so each term's column is a posting list over jobs
+                X_jobs = vectorizer.fit_transform(jd_cleans).tocsc()
             except Exception as e:
-                print(f"JD match calculation warning: {str(e)}")
-                jd_match = 0
+                print(f"Job index build warning: {str(e)}")
+                vectorizer, X_jobs = None, None
         
-        # Skills Match (60% weight)
-        found_skills = []
-        if skills_list and cv_clean:
+        # Job x skill occurrence counts, so duplicated skills weigh as before
+        skill_positions = {}
+        rows, cols = [], []
+        totals = np.zeros(len(jobs), dtype=np.float32)
+        for row, job in enumerate(jobs):
+            skills_list = job.skills_list
+            totals[row] = len(skills_list)
             for skill in skills_list:
-                if re.search(rf'\b{re.escape(skill)}\b', cv_clean):
-                    found_skills.append(skill)
+                rows.append(row)
+                cols.append(skill_positions.setdefault(skill, len(skill_positions)))
+        skill_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+            shape=(len(jobs), len(skill_positions))
+        )
         
-        skills_match = len(found_skills) / len(skills_list) if skills_list else 0
+        single_word_skills, multi_word_skills = partition_skills(skill_positions)
         
-        total_score = (skills_match * 0.6 + jd_match * 0.4) * 100
+        self.vectorizer = vectorizer
+        self.X_jobs = X_jobs
+        self.skill_positions = skill_positions
+        self.single_word_skills = single_word_skills
+        self.multi_word_skills = multi_word_skills
+        self.skill_matrix = skill_matrix
+        self.skill_totals = totals
+        self.positions = {job_id: row for row, job_id in enumerate(job_ids)}
+        self.job_ids = job_ids
+        self.job_id_set = frozenset(job_ids)
+        self.score_cache = OrderedDict()
+    
+    def ensure_current(self):
+        """Rebuild if active posts were added or removed; only job ids are loaded otherwise."""
+        job_ids = frozenset(job_id for (job_id,) in
+                            db.session.query(JobPost.id).filter(JobPost.is_active == True))
+        with self._lock:
+            if job_ids != self.job_id_set:
+                self._build(JobPost.query.filter(JobPost.is_active == True).all())
+    
+    def _found_skills_vector(self, cv_clean):
+        found = find_skills(cv_clean, self.single_word_skills, self.multi_word_skills)
+        found_vec = np.zeros(len(self.skill_positions), dtype=np.float32)
+        found_vec[[self.skill_positions[skill] for skill in found]] = 1
+        return found_vec
+    
+    def score(self, cv_clean):
+        """Total match score (0-100) of a cleaned CV against every indexed job, in index order."""
+        with self._lock:
+            n_jobs = len(self.job_ids)
+            
+            # JD Match (40% weight)
+            jd_matches = np.zeros(n_jobs, dtype=np.float32)
+            if self.vectorizer is not None and cv_clean.strip():
+                resume_vec = self.vectorizer.transform([cv_clean])
+                # Only the posting lists of terms present in the resume are touched
+                jd_matches = self.X_jobs[:, resume_vec.indices] @ resume_vec.data
+            
+            # Skills Match (60% weight)
+            skills_match = np.zeros(n_jobs, dtype=np.float32)
+            if self.skill_positions and cv_clean:
+                hits = self.skill_matrix @ self._found_skills_vector(cv_clean)
+                np.divide(hits, self.skill_totals, out=skills_match, where=self.skill_totals > 0)
+            
+            return (skills_match * 0.6 + jd_matches * 0.4) * 100
+    
+    def cached_score(self, cv_clean):
+        """score(), memoized on the CV's content until the index is rebuilt."""
+        key = text_digest(cv_clean)
+        with self._lock:
+            scores = self.score_cache.get(key)
+            if scores is not None:
+                self.score_cache.move_to_end(key)
+                return scores
+            scores = self.score(cv_clean)
+            self.score_cache[key] = scores
+            max_entries = max(1, _SCORE_CACHE_MAX_BYTES // max(scores.nbytes, 1))
+            while len(self.score_cache) > max_entries:
+                self.score_cache.popitem(last=False)
+            return scores
+    
+    def score_jobs(self, cv_clean, jobs):
+        # Checked before taking the lock so concurrent readers don't queue behind the query
+        self.ensure_current()
+        with self._lock:
+            scores = self.cached_score(cv_clean)
+            positions = self.positions
+        # A post deactivated since the check is scored on its own
+        return [round(float(scores[positions[job.id]]), 2) if job.id in positions
+                else calculate_matches([cv_clean], job)[0]['total_score'] for job in jobs]
+
+    def _score_row(self, cv_clean, row):
+        scores = self.score_cache.get(text_digest(cv_clean))
+        if scores is not None:
+            return round(float(scores[row]), 2)
         
-        return {
-            'total_score': round(total_score, 2),
-            'jd_match': round(jd_match * 100, 2),
-            'skills_match': round(skills_match * 100, 2),
-            'missing_skills': ', '.join(list(set(skills_list) - set(found_skills))),
-            'found_skills': ', '.join(found_skills)
-        }
-    except Exception as e:
-        print(f"Match calculation error: {str(e)}")
-        return {
-            'total_score': 0,
-            'jd_match': 0,
-            'skills_match': 0,
-            'missing_skills': '',
-            'found_skills': ''
-        }
+        # JD Match (40% weight)
+        jd_match = 0.0
+        if self.vectorizer is not None and cv_clean.strip():
+            resume_vec = self.vectorizer.transform([cv_clean])
+            jd_match = float((self.X_jobs[row] @ resume_vec.T).toarray()[0, 0])
+        
+        # Skills Match (60% weight)
+        skills_match = 0.0
+        if self.skill_totals[row] > 0 and cv_clean:
+            hits = self.skill_matrix[row] @ self._found_skills_vector(cv_clean)
+            skills_match = float(hits[0]) / float(self.skill_totals[row])
+        
+        return round((skills_match * 0.6 + jd_match * 0.4) * 100, 2)
+    
+    def score_job(self, cv_clean, job_post):
+        """Total match score (0-100) of a cleaned CV against a single job."""
+        self.ensure_current()
+        with self._lock:
+            row = self.positions.get(job_post.id)
+            if row is not None:
+                return self._score_row(cv_clean, row)
+        # Inactive posts are not indexed; score this one pair on its own
+        return calculate_matches([cv_clean], job_post)[0]['total_score']
+
+job_index = JobCorpusIndex()
 
 # Form Classes
 class LoginForm(FlaskForm):
@@ -212,7 +635,8 @@ def index():
         user = User.query.filter_by(email=form.email.data).first()
         
         if user:
-            if check_password_hash(user.password_hash, form.password.data) and user.user_type == form.user_type.data:
+            if verify_password(user, form.password.data) and user.user_type == form.user_type.data:
+                db.session.commit()
                 session['user_id'] = user.id
                 session['user_type'] = user.user_type
                 session['user_name'] = user.name
@@ -226,7 +650,7 @@ def index():
                 flash('Invalid credentials or user type mismatch', 'error')
         else:
             # Auto-register new user
-            hashed_password = generate_password_hash(form.password.data)
+            hashed_password = hash_password(form.password.data)
             new_user = User(
                 email=form.email.data,
                 password_hash=hashed_password,
@@ -269,13 +693,16 @@ def post_job():
             job_title=form.job_title.data,
             company_name=form.company_name.data,
             job_description=form.job_description.data,
+            job_description_clean=clean_text(form.job_description.data),
             required_skills=form.required_skills.data,
+            required_skills_normalized=json.dumps(parse_skills(form.required_skills.data)),
             location=form.location.data,
             salary_range=form.salary_range.data,
             job_type=form.job_type.data
         )
         db.session.add(job_post)
         db.session.commit()
+        job_index.invalidate()
         
         flash('Job posted successfully!', 'success')
         return redirect(url_for('recruiter_dashboard'))
@@ -291,31 +718,62 @@ def analyze_cvs(job_id):
     
     if request.method == 'POST':
         files = request.files.getlist('cv_files')
-        candidates = []
+        uploads = []
         
         for file in files:
             if file and file.filename and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
                 try:
-                    file.save(filepath)
-                    cv_text = extract_text_from_file(filepath)
-                    analysis = calculate_match(cv_text, job_post.job_description, job_post.required_skills)
-                    
-                    candidates.append({
-                        'filename': filename,
-                        'analysis': analysis,
-                        'cv_preview': cv_text[:200] + ("..." if len(cv_text) > 200 else "")
-                    })
-                    
+                    # Extract straight from the upload's bytes; nothing touches the disk
+                    uploads.append((file.filename, secure_filename(file.filename), file.read()))
                 except Exception as e:
                     flash(f"Error processing {file.filename}: {str(e)}", 'error')
-                finally:
-                    if os.path.exists(filepath):
-                        try:
-                            os.remove(filepath)
-                        except:
-                            pass
+        
+        # Serve previously seen files from the extraction cache here, and only ship
+        # the remaining uploads' bytes to the worker processes
+        texts = {}
+        futures = {}
+        for position, (original_name, _, file_bytes) in enumerate(uploads):
+            cache_path = extraction_cache_path(original_name, file_bytes)
+            cached_text = read_extraction_cache(cache_path)
+            if cached_text is not None:
+                texts[position] = cached_text
+            else:
+                try:
+                    pool, future = submit_extraction(original_name, file_bytes)
+                    futures[future] = (position, cache_path, pool)
+                except Exception as e:
+                    flash(f"Error processing {original_name}: {str(e)}", 'error')
+        
+        try:
+            for future in as_completed(futures, timeout=app.config['EXTRACT_TIMEOUT']):
+                position, cache_path, pool = futures[future]
+                try:
+                    texts[position] = future.result()
+                    write_extraction_cache(cache_path, texts[position])
+                except BrokenProcessPool:
+                    replace_broken_extract_pool(pool)
+                    flash(f"Error processing {uploads[position][0]}: extraction worker crashed", 'error')
+                except Exception as e:
+                    flash(f"Error processing {uploads[position][0]}: {str(e)}", 'error')
+        except FuturesTimeoutError:
+            # A stuck worker would hold its slot for every later request, so
+            # give up on the pool as well as on this request's pending files
+            for future, (position, _, pool) in futures.items():
+                if not future.done():
+                    future.cancel()
+                    replace_broken_extract_pool(pool)
+                    flash(f"Error processing {uploads[position][0]}: extraction timed out", 'error')
+        extracted = [(uploads[position][1], texts[position]) for position in sorted(texts)]
+        
+        # Score all CVs together so they are vectorized in one pass
+        analyses = calculate_matches([clean_text(cv_text) for _, cv_text in extracted], job_post)
+        candidates = []
+        for (filename, cv_text), analysis in zip(extracted, analyses):
+            candidates.append({
+                'filename': filename,
+                'analysis': analysis,
+                'cv_preview': cv_text[:200] + ("..." if len(cv_text) > 200 else "")
+            })
         
         if candidates:
             candidates.sort(key=lambda x: x['analysis']['total_score'], reverse=True)
@@ -336,28 +794,30 @@ def job_seeker_dashboard():
     profile = JobSeekerProfile.query.filter_by(user_id=session['user_id']).first()
     job_posts = []
     
-    # Get all active job posts
-    all_job_posts = JobPost.query.filter_by(is_active=True).order_by(JobPost.created_at.desc()).all()
+    # Get all active job posts together with this seeker's application, if any
+    rows = db.session.query(JobPost, JobApplication).outerjoin(
+        JobApplication,
+        and_(JobApplication.job_post_id == JobPost.id,
+             JobApplication.job_seeker_id == session['user_id'])
+    ).filter(JobPost.is_active == True).order_by(JobPost.created_at.desc()).all()
     
-    for job in all_job_posts:
-        # Check if already applied
-        applied = JobApplication.query.filter_by(
-            job_post_id=job.id, 
-            job_seeker_id=session['user_id']
-        ).first()
-        
-        if profile and profile.skills:
-            match_result = calculate_match(
-                profile.resume_text or profile.skills,
-                job.job_description,
-                job.required_skills
-            )
-        else:
-            match_result = {'total_score': 0}
-        
+    all_job_posts = []
+    applications = {}
+    for job, application in rows:
+        if job.id not in applications:
+            all_job_posts.append(job)
+            applications[job.id] = application
+    
+    if profile and profile.skills and all_job_posts:
+        match_scores = job_index.score_jobs(profile.match_text_clean, all_job_posts)
+    else:
+        match_scores = [0] * len(all_job_posts)
+    
+    for job, match_score in zip(all_job_posts, match_scores):
+        applied = applications.get(job.id)
         job_posts.append({
             'job': job,
-            'match_score': match_result['total_score'],
+            'match_score': match_score,
             'applied': applied is not None,
             'application_status': applied.status if applied else None
         })
@@ -382,20 +842,11 @@ def job_seeker_profile():
         files = request.files.getlist('resume_file')
         for file in files:
             if file and file.filename and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
                 try:
-                    file.save(filepath)
-                    resume_text = extract_text_from_file(filepath)
+                    resume_text = extract_text_from_file(file.filename, file.read())
                     break  # Use first valid file
                 except Exception as e:
                     flash(f"Error processing resume: {str(e)}", 'error')
-                finally:
-                    if os.path.exists(filepath):
-                        try:
-                            os.remove(filepath)
-                        except:
-                            pass
         
         if profile:
             # Update existing profile
@@ -407,6 +858,7 @@ def job_seeker_profile():
             profile.experience_level = form.experience_level.data
             if resume_text:
                 profile.resume_text = resume_text
+                profile.resume_text_clean = clean_text(resume_text)
         else:
             # Create new profile
             profile = JobSeekerProfile(
@@ -417,7 +869,8 @@ def job_seeker_profile():
                 desired_location=form.desired_location.data,
                 desired_salary=form.desired_salary.data,
                 experience_level=form.experience_level.data,
-                resume_text=resume_text
+                resume_text=resume_text,
+                resume_text_clean=clean_text(resume_text)
             )
             db.session.add(profile)
         
@@ -452,21 +905,18 @@ def apply_job(job_id):
         job_post = JobPost.query.get_or_404(job_id)
         
         if profile:
-            match_result = calculate_match(
-                profile.resume_text or profile.skills,
-                job_post.job_description,
-                job_post.required_skills
-            )
+            # Score against the shared job index so the stored score matches the dashboard
+            match_score = job_index.score_job(profile.match_text_clean, job_post)
             
             application = JobApplication(
                 job_post_id=job_id,
                 job_seeker_id=session['user_id'],
-                match_score=match_result['total_score']
+                match_score=match_score
             )
             db.session.add(application)
             db.session.commit()
             
-            flash(f'Application submitted successfully! Match score: {match_result["total_score"]}%', 'success')
+            flash(f'Application submitted successfully! Match score: {match_score}%', 'success')
         else:
             flash('Please complete your profile before applying', 'error')
     else:
@@ -484,14 +934,15 @@ def view_applications(job_id):
         flash('Access denied', 'error')
         return redirect(url_for('recruiter_dashboard'))
     
-    applications = JobApplication.query.filter_by(job_post_id=job_id).order_by(JobApplication.match_score.desc()).all()
+    applications = JobApplication.query.filter_by(job_post_id=job_id).options(
+        joinedload(JobApplication.job_seeker).joinedload(User.profile)
+    ).order_by(JobApplication.match_score.desc()).all()
     
     application_data = []
     for app in applications:
-        profile = JobSeekerProfile.query.filter_by(user_id=app.job_seeker_id).first()
         application_data.append({
             'application': app,
-            'profile': profile,
+            'profile': app.job_seeker.profile,
             'user': app.job_seeker
         })
     
@@ -541,10 +992,47 @@ def handle_exception(error):
 def init_db():
     with app.app_context():
         db.create_all()
+        # create_all skips tables that already exist, so add any columns and
+        # indexes they lack
+        inspector = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    try:
+                        with db.engine.begin() as connection:
+                            connection.execute(sql_text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+                    except OperationalError as e:
+                        # Another process added it after we inspected the table
+                        if 'duplicate column name' not in str(e):
+                            raise
+            for index in table.indexes:
+                try:
+                    index.create(bind=db.engine, checkfirst=True)
+                except OperationalError as e:
+                    # Another process created it between the check and the CREATE
+                    if 'already exists' not in str(e):
+                        raise
         print("Database initialized successfully!")
 
+# Schema setup is an explicit step (`flask --app app init-db`, run by the web
+# process before gunicorn forks its workers) rather than import-time work
+# racing across every worker
+@app.cli.command('init-db')
+def init_db_command():
+    init_db()
+
+# Compile every template once at startup; with auto-reload off they are never re-checked
+def warm_template_cache():
+    for template_name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(template_name)
+
+warm_template_cache()
+
 # ... all your existing code ...
 
 if __name__ == '__main__':
+    init_db()
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
@@ -2,8 +2,21 @@ import os
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-here-change-in-production'
-    UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
     ALLOWED_EXTENSIONS = {'pdf', 'docx'}
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///job_matching.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    # Per server process, so keep this small when running several gunicorn workers
+    EXTRACT_WORKERS = int(os.environ.get('EXTRACT_WORKERS') or min(4, os.cpu_count() or 1))
+    EXTRACT_TIMEOUT = 60  # seconds for all of a request's uploads
+    EXTRACT_CACHE_FOLDER = 'extract_cache'
+    EXTRACT_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+    EXTRACT_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+    EXTRACT_CACHE_SWEEP_INTERVAL = 60 * 60  # 1 hour
+    SQLALCHEMY_DATABASE_URI = os.environ.get('SQLALCHEMY_DATABASE_URI') or 'sqlite:///job_matching.db'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_size': 10,
+        'pool_recycle': 3600
+    }
+    TEMPLATES_AUTO_RELOAD = False
+    EXPLAIN_TEMPLATE_LOADING = False
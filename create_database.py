@@ -4,7 +4,7 @@ import sys
 from datetime import datetime
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash
+from argon2 import PasswordHasher
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -13,6 +13,7 @@ app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///job_matching.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 db = SQLAlchemy(app)
+password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
 
 # Database Models (same as in your app.py)
 class User(db.Model):
@@ -24,24 +25,30 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class JobPost(db.Model):
+    __table_args__ = (
+        db.Index('ix_jobpost_active_created', 'is_active', 'created_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     job_title = db.Column(db.String(200), nullable=False)
     company_name = db.Column(db.String(200), nullable=False)
     job_description = db.Column(db.Text, nullable=False)
+    job_description_clean = db.Column(db.Text)
     required_skills = db.Column(db.Text, nullable=False)
+    required_skills_normalized = db.Column(db.Text)
     location = db.Column(db.String(100))
     salary_range = db.Column(db.String(100))
     job_type = db.Column(db.String(50))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     is_active = db.Column(db.Boolean, default=True)
     user = db.relationship('User', backref=db.backref('job_posts', lazy=True))
 
 class JobSeekerProfile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     full_name = db.Column(db.String(200), nullable=False)
     resume_text = db.Column(db.Text)
+    resume_text_clean = db.Column(db.Text)
     skills = db.Column(db.Text)
     desired_position = db.Column(db.String(200))
     desired_location = db.Column(db.String(100))
@@ -51,9 +58,13 @@ class JobSeekerProfile(db.Model):
     user = db.relationship('User', backref=db.backref('profile', uselist=False))
 
 class JobApplication(db.Model):
+    __table_args__ = (
+        db.Index('ix_application_post_seeker', 'job_post_id', 'job_seeker_id'),
+        db.Index('ix_application_post_score', 'job_post_id', 'match_score'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     job_post_id = db.Column(db.Integer, db.ForeignKey('job_post.id'), nullable=False)
-    job_seeker_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    job_seeker_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     match_score = db.Column(db.Float)
     status = db.Column(db.String(50), default='pending')
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -70,14 +81,14 @@ def create_database():
         # Create sample users
         sample_recruiter = User(
             email="recruiter@company.com",
-            password_hash=generate_password_hash("password123"),
+            password_hash=password_hasher.hash("password123"),
             user_type="recruiter",
             name="John Recruiter"
         )
         
         sample_job_seeker = User(
             email="jobseeker@email.com",
-            password_hash=generate_password_hash("password123"),
+            password_hash=password_hasher.hash("password123"),
             user_type="job_seeker",
             name="Jane Candidate"
         )
@@ -0,0 +1,66 @@
+from werkzeug.security import generate_password_hash
+
+from app import User, db, verify_password
+
+PASSWORD = 'correct horse'
+
+
+def legacy_user(user_type='job_seeker'):
+    return User(
+        email='seeker@example.com',
+        password_hash=generate_password_hash(PASSWORD, method='pbkdf2:sha256'),
+        user_type=user_type,
+        name='Seeker'
+    )
+
+
+def stored_hash(app):
+    with app.app_context():
+        return User.query.filter_by(email='seeker@example.com').one().password_hash
+
+
+def test_legacy_hash_verifies_and_is_upgraded_to_argon2id():
+    user = legacy_user()
+    assert verify_password(user, PASSWORD)
+    assert user.password_hash.startswith('$argon2id$')
+    # The upgraded hash keeps verifying
+    assert verify_password(user, PASSWORD)
+
+
+def test_wrong_password_leaves_hash_unchanged():
+    user = legacy_user()
+    legacy_hash = user.password_hash
+    assert not verify_password(user, 'wrong password')
+    assert user.password_hash == legacy_hash
+
+
+def test_login_with_wrong_user_type_does_not_commit_rehash(app, client):
+    with app.app_context():
+        user = legacy_user()
+        db.session.add(user)
+        db.session.commit()
+        legacy_hash = user.password_hash
+
+    response = client.post('/', data={
+        'email': 'seeker@example.com',
+        'password': PASSWORD,
+        'user_type': 'recruiter'
+    })
+
+    assert response.status_code == 200
+    assert stored_hash(app) == legacy_hash
+
+
+def test_successful_login_commits_rehash(app, client):
+    with app.app_context():
+        db.session.add(legacy_user())
+        db.session.commit()
+
+    response = client.post('/', data={
+        'email': 'seeker@example.com',
+        'password': PASSWORD,
+        'user_type': 'job_seeker'
+    })
+
+    assert response.status_code == 302
+    assert stored_hash(app).startswith('$argon2id$')
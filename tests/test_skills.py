@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from app import clean_text, compute_skills_match, parse_skills
+
+
+def baseline_skills_match(cv_clean, skills_list):
+    # The original per-skill regex scan that compute_skills_match must agree with
+    found_skills = []
+    if skills_list and cv_clean:
+        for skill in skills_list:
+            if re.search(rf'\b{re.escape(skill)}\b', cv_clean):
+                found_skills.append(skill)
+    skills_match = len(found_skills) / len(skills_list) if skills_list else 0
+    return skills_match, found_skills
+
+
+@pytest.mark.parametrize('cv_text, required_skills', [
+    ('Built apps in React. Native modules too.', 'React Native, React'),
+    ('Shipped React Native apps', 'React Native, React'),
+    ('Python and SQL every day', 'Python, python, SQL, Go'),
+    ('Python developer', '!!!, Python'),
+    ('...', '!!!, Python'),
+    ('', 'Python'),
+    ('Python developer', ''),
+])
+def test_skills_match_agrees_with_baseline(cv_text, required_skills):
+    cv_clean = clean_text(cv_text)
+    skills_list = parse_skills(required_skills)
+    assert compute_skills_match(cv_clean, skills_list) == baseline_skills_match(cv_clean, skills_list)
+
+
+def test_phrase_does_not_match_across_stripped_punctuation():
+    skills_match, found_skills = compute_skills_match(
+        clean_text('Built apps in React. Native modules too.'), ['react native', 'react'])
+    assert found_skills == ['react']
+    assert skills_match == 0.5
+
+
+def test_duplicate_skills_are_counted_like_the_baseline():
+    skills_match, found_skills = compute_skills_match(clean_text('Python developer'), ['python', 'python', 'sql'])
+    assert found_skills == ['python', 'python']
+    assert skills_match == pytest.approx(2 / 3)
+
+
+def test_skill_that_normalizes_to_empty_matches_any_worded_cv():
+    skills_list = parse_skills('!!!, Python')
+    assert skills_list == ['', 'python']
+    assert compute_skills_match(clean_text('Python developer'), skills_list) == (1.0, ['', 'python'])
+    assert compute_skills_match(clean_text('...'), skills_list) == (0.0, [])